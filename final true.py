@@ -1,89 +1,237 @@
+from array import array
+import bisect
+import concurrent.futures
+import functools
+from collections import defaultdict
+import mmap
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
+import re
+import sys
+import threading
 import unittest
 
+# Word tokens over raw bytes, so the tokenizer can scan an mmap'd file in
+# place; still strips punctuation that str.split() would leave attached
+# (e.g. "test." -> "test").
+_TOKEN_RE = re.compile(rb"\w+")
+
 class DocumentParser:
     """Parses text documents."""
     def parse_document(self, filepath):
         try:
-            with open(filepath, 'r') as f:
-                text = f.read().lower()
-                words = text.split()
-                return words
+            with open(filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return  # mmap rejects empty files
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # The regex walks the OS page cache directly; only the
+                    # matched tokens are ever copied out. bytes.lower() runs
+                    # in C, and interning collapses repeated words to one
+                    # shared str with a cached hash.
+                    for match in _TOKEN_RE.finditer(mm):
+                        yield sys.intern(match.group().lower().decode("ascii"))
         except FileNotFoundError:
             raise FileNotFoundError(f"Error: File not found at {filepath}")
         except Exception as e:
             raise Exception(f"An error occurred while reading {filepath}: {e}")
 
+def _parse_words(parser, filepath):
+    """Collect a file's unique words inside a worker process."""
+    return set(parser.parse_document(filepath))
+
 class IndexBuilder:
     """Builds an inverted index from a directory of text files."""
-    def __init__(self, parser=None):
+    def __init__(self, parser=None, sorter=None):
         self.parser = parser or DocumentParser()
+        self.sorter = sorter or sorted
+        self.docs = []  # doc_id -> filepath
 
     def build_index(self, directory):
         if not os.path.isdir(directory):
             raise NotADirectoryError(f"Error: '{directory}' is not a valid directory.")
 
-        local_index = {}
-        for filename in os.listdir(directory):
-            filepath = os.path.join(directory, filename)
-            if filepath.endswith(".txt"):
+        with os.scandir(directory) as entries:
+            paths = [entry.path for entry in entries
+                     if entry.is_file() and entry.name.endswith(".txt")]
+
+        self.docs = []
+        local_index = defaultdict(list)
+        if not paths:
+            return dict(local_index)
+
+        # Parsing is CPU-bound inside the GIL, so spread it across processes
+        # and merge the per-file word lists back in the main process.
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            futures = {executor.submit(_parse_words, self.parser, path): path
+                       for path in paths}
+            for future in concurrent.futures.as_completed(futures):
+                # Posting lists hold compact integer doc ids; self.docs maps
+                # them back to paths. Ints hash and compare far faster than
+                # filepath strings and cost 4 bytes each in an array.
+                doc_id = len(self.docs)
+                self.docs.append(sys.intern(futures[future]))
                 try:
-                    words = self.parser.parse_document(filepath)
-                    for word in words:
-                        if word in local_index:
-                            if filepath not in local_index[word]:
-                                local_index[word].append(filepath)
-                        else:
-                            local_index[word] = [filepath]
+                    # Workers dedup words per file, so each doc id lands in a
+                    # posting list at most once and a plain append suffices —
+                    # no set hashing in this loop. Words come back from the
+                    # workers as fresh strings, so re-intern them here.
+                    for word in future.result():
+                        local_index[sys.intern(word)].append(doc_id)
                 except (FileNotFoundError, Exception) as e:
                     messagebox.showerror("Indexing Error", str(e))
-        return local_index
+        # The index is immutable after the build, so sort each posting list
+        # once here instead of on every query.
+        return {word: array('I', self.sorter(postings))
+                for word, postings in local_index.items()}
+
+# Consecutive wins one side needs before _merge switches to galloping.
+_MIN_GALLOP = 7
+
+def _merge(a, lo, mid, hi):
+    """Merge the adjacent sorted runs a[lo:mid] and a[mid:hi] in place.
+
+    When one run wins _MIN_GALLOP comparisons in a row, gallop: binary
+    search how far the winning side extends and copy that whole block in
+    one slice assignment instead of element by element.
+    """
+    left = a[lo:mid]
+    i, j, k = 0, mid, lo
+    left_wins = right_wins = 0
+    while i < len(left) and j < hi:
+        if left[i] <= a[j]:
+            a[k] = left[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= _MIN_GALLOP:
+                stop = bisect.bisect_right(left, a[j], i, len(left))
+                a[k:k + stop - i] = left[i:stop]
+                k += stop - i
+                i = stop
+                left_wins = 0
+        else:
+            a[k] = a[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= _MIN_GALLOP:
+                stop = bisect.bisect_left(a, left[i], j, hi)
+                a[k:k + stop - j] = a[j:stop]
+                k += stop - j
+                j = stop
+                right_wins = 0
+    a[k:k + len(left) - i] = left[i:]
+
+def _merge_sort(data):
+    """Pure-Python Timsort-style mergesort.
+
+    Kept as an alternative for the IndexBuilder ``sorter`` hook. Detects
+    natural ascending runs (reversing strictly descending ones in place),
+    keeps a stack of pending runs under the usual Timsort size invariants,
+    and merges with galloping, so nearly-sorted input sorts in O(n).
+    """
+    a = list(data)
+    n = len(a)
+    if n <= 1:
+        return a
+
+    def merge_at(idx):
+        lo, l1 = runs[idx]
+        mid, l2 = runs[idx + 1]
+        _merge(a, lo, mid, mid + l2)
+        runs[idx] = (lo, l1 + l2)
+        del runs[idx + 1]
+
+    runs = []  # stack of (start, length) for pending runs
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and a[hi] < a[lo]:
+            while hi < n and a[hi] < a[hi - 1]:
+                hi += 1
+            a[lo:hi] = a[lo:hi][::-1]
+        else:
+            while hi < n and a[hi] >= a[hi - 1]:
+                hi += 1
+        runs.append((lo, hi - lo))
+        lo = hi
+        # Restore the invariants X > Y + Z and Y > Z on the run stack.
+        while True:
+            if len(runs) >= 3 and runs[-3][1] <= runs[-2][1] + runs[-1][1]:
+                merge_at(-3 if runs[-3][1] < runs[-1][1] else -2)
+            elif len(runs) >= 2 and runs[-2][1] <= runs[-1][1]:
+                merge_at(-2)
+            else:
+                break
+    while len(runs) > 1:
+        merge_at(-2)
+    return a
 
 class SearchEngine:
     """Searches the document index."""
-    def __init__(self, index=None, sorter=None):
+    def __init__(self, index=None, docs=None):
+        self.docs = docs if docs is not None else []
         self.index = index if index is not None else {}
-        self.sorter = sorter or self._merge_sort
-
-    def _merge(self, left, right):
-        merged = []
-        left_index = 0
-        right_index = 0
 
-        while left_index < len(left) and right_index < len(right):
-            if left[left_index] < right[right_index]:
-                merged.append(left[left_index])
-                left_index += 1
-            else:
-                merged.append(right[right_index])
-                right_index += 1
-
-        merged.extend(left[left_index:])
-        merged.extend(right[right_index:])
-        return merged
-
-    def _merge_sort(self, data):
-        if len(data) <= 1:
-            return data
-        mid = len(data) // 2
-        left = data[:mid]
-        right = data[mid:]
-        left_sorted = self._merge_sort(left)
-        right_sorted = self._merge_sort(right)
-        return self._merge(left_sorted, right_sorted)
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, value):
+        self._index = value
+        # Shard the vocabulary by first character so each shard's hash
+        # table stays small enough to be cache-resident; a query touches
+        # exactly one shard.
+        self.shards = [{} for _ in range(64)]
+        for word, postings in value.items():
+            self.shards[ord(word[0]) & 63][word] = postings
+        # Prefix trie over the vocabulary for autocomplete: a lookup walks
+        # one dict hop per character, independent of vocabulary size. The
+        # "" key marks a complete word.
+        self._trie = {}
+        for word in value:
+            node = self._trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = word
+        # Repeated queries dominate interactive use, so memoize per-term
+        # results; replacing the index drops the cache with it.
+        @functools.lru_cache(maxsize=1024)
+        def lookup(term):
+            # Posting lists arrive pre-sorted and deduplicated from
+            # build_index; translate the integer doc ids back to paths.
+            shard = self.shards[ord(term[0]) & 63]
+            docs = self.docs
+            return tuple(docs[i] for i in shard.get(term, ()))
+        self._lookup = lookup
 
     def search_index(self, search_term):
         if not search_term:
             return []
-        search_term_lower = search_term.lower()
-        if search_term_lower in self.index:
-            results = self.index[search_term_lower]
-            sorted_results = self._merge_sort(list(set(results))) # Ensure unique and sorted results
-            return sorted_results
-        else:
+        return list(self._lookup(search_term.lower()))
+
+    def complete(self, prefix):
+        """Return all indexed words starting with ``prefix``, sorted."""
+        if not prefix:
             return []
+        node = self._trie
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        words = []
+        stack = [node]
+        while stack:
+            for char, child in stack.pop().items():
+                if char == "":
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return sorted(words)
 
 class DocumentSearchApp:
     """GUI application for searching documents."""
@@ -130,6 +278,8 @@ class DocumentSearchApp:
 
         try:
             self.document_index = self.index_builder.build_index(directory)
+            # Set docs before index: assigning index rebuilds the query cache.
+            self.search_engine.docs = self.index_builder.docs
             self.search_engine.index = self.document_index
             messagebox.showinfo("Indexing Complete", f"Successfully indexed documents in:\n{directory}")
         except (NotADirectoryError, Exception) as e:
@@ -146,11 +296,22 @@ class DocumentSearchApp:
             self.results_listbox.delete(0, tk.END)
             return
 
+        # Run the search off the Tk event thread so big result sets cannot
+        # freeze the GUI; results are marshalled back via master.after.
+        threading.Thread(target=self._do_search, args=(search_term,),
+                         daemon=True).start()
+
+    def _do_search(self, search_term):
         results = self.search_engine.search_index(search_term)
+        self.master.after(0, self._populate_results, results)
+
+    def _populate_results(self, results):
         self.results_listbox.delete(0, tk.END) # Clear previous results
         if results:
-            for filepath in results:
-                self.results_listbox.insert(tk.END, filepath)
+            # One insert call per batch is one Tk round-trip instead of one
+            # per row.
+            for start in range(0, len(results), 500):
+                self.results_listbox.insert(tk.END, *results[start:start + 500])
         else:
             self.results_listbox.insert(tk.END, "No results found.")
 
@@ -177,21 +338,25 @@ class TestDocumentSearch(unittest.TestCase):
 
     def test_parse_document(self):
         filepath = os.path.join(self.test_dir, "file1.txt")
-        words = self.parser.parse_document(filepath)
-        self.assertEqual(words, ["this", "is", "a", "test", "document", "with", "the", "word", "test."])
+        words = list(self.parser.parse_document(filepath))
+        self.assertEqual(words, ["this", "is", "a", "test", "document", "with", "the", "word", "test"])
 
     def test_build_index(self):
         index = self.index_builder.build_index(self.test_dir)
+        docs = self.index_builder.docs
         self.assertIn("test", index)
         self.assertEqual(len(index["test"]), 2)
-        self.assertIn(os.path.join(self.test_dir, "file1.txt"), index["test"])
-        self.assertIn(os.path.join(self.test_dir, "file3.txt"), index["test"])
+        test_paths = [docs[i] for i in index["test"]]
+        self.assertIn(os.path.join(self.test_dir, "file1.txt"), test_paths)
+        self.assertIn(os.path.join(self.test_dir, "file3.txt"), test_paths)
         self.assertIn("another", index)
         self.assertEqual(len(index["another"]), 1)
-        self.assertIn(os.path.join(self.test_dir, "file2.txt"), index["another"])
+        self.assertIn(os.path.join(self.test_dir, "file2.txt"),
+                      [docs[i] for i in index["another"]])
 
     def test_search_index_found(self):
         index = self.index_builder.build_index(self.test_dir)
+        self.search_engine.docs = self.index_builder.docs
         self.search_engine.index = index
         results = self.search_engine.search_index("test")
         self.assertEqual(len(results), 2)
@@ -200,12 +365,22 @@ class TestDocumentSearch(unittest.TestCase):
 
     def test_search_index_not_found(self):
         index = self.index_builder.build_index(self.test_dir)
+        self.search_engine.docs = self.index_builder.docs
         self.search_engine.index = index
         results = self.search_engine.search_index("nonexistentword")
         self.assertEqual(len(results), 0)
 
+    def test_complete(self):
+        index = self.index_builder.build_index(self.test_dir)
+        self.search_engine.docs = self.index_builder.docs
+        self.search_engine.index = index
+        self.assertEqual(self.search_engine.complete("te"), ["test"])
+        self.assertEqual(self.search_engine.complete("th"), ["the", "this"])
+        self.assertEqual(self.search_engine.complete("xyz"), [])
+
     def test_search_index_empty_term(self):
         index = self.index_builder.build_index(self.test_dir)
+        self.search_engine.docs = self.index_builder.docs
         self.search_engine.index = index
         results = self.search_engine.search_index("")
         self.assertEqual(len(results), 0)